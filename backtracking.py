@@ -0,0 +1,254 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import pickle
+
+FIRST_SOLUTION = 'first'
+ALL_SOLUTIONS = 'all'
+COUNT_SOLUTIONS = 'count'
+EXHAUSTED = object()
+POLL_INTERVAL = 1024
+shard_first_stop = None
+
+
+class FinishedFlag:
+
+    def __init__(self):
+        self.finished = False
+        self.counter = 0
+
+    def is_finished(self):
+        return self.finished
+
+    def mark_finished(self):
+        self.finished = True
+
+    def tick(self):
+        self.counter = self.counter + 1
+
+    def __str__(self):
+        return "Finished: %s (%d)" % (self.finished, self.counter)
+
+
+class SharedFinishedFlag(FinishedFlag):
+
+    def __init__(self, first_stop, index, poll_interval=POLL_INTERVAL):
+        super().__init__()
+        self.first_stop = first_stop
+        self.index = index
+        self.poll_interval = poll_interval
+        self.stopped = False
+
+    def is_finished(self):
+        if not self.finished and (self.counter - 1) % self.poll_interval == 0 and self.first_stop.value < self.index:
+            self.finished = True
+        return self.finished
+
+    def mark_finished(self):
+        self.finished = True
+        self.stopped = True
+        with self.first_stop.get_lock():
+            if self.index < self.first_stop.value:
+                self.first_stop.value = self.index
+
+
+class BacktrackingProblem:
+
+    def is_a_solution(self, a, k):
+        raise NotImplementedError
+
+    def process_solution(self, a, k):
+        pass
+
+    def construct_candidates(self, a, k):
+        raise NotImplementedError
+
+    def make_move(self, a, k):
+        pass
+
+    def unmake_move(self, a, k):
+        pass
+
+
+class Backtracker:
+
+    def __init__(self, problem, max_depth, finished_flag=None, process_solution=None):
+        self.problem = problem
+        self.process_solution = problem.process_solution if process_solution is None else process_solution
+        self.max_depth = max_depth
+        self.a = [None] * (max_depth + 1)
+        self.candidates = [None] * (max_depth + 1)
+        self.finished_flag = FinishedFlag() if finished_flag is None else finished_flag
+        self.solutions = 0
+
+    def search(self, mode=ALL_SOLUTIONS, prefix=()):
+        if mode not in (FIRST_SOLUTION, ALL_SOLUTIONS, COUNT_SOLUTIONS):
+            raise ValueError("%s is not a valid search mode" % mode)
+        problem = self.problem
+        a = self.a
+        candidates = self.candidates
+        finished_flag = self.finished_flag
+        max_depth = self.max_depth
+        base = len(prefix)
+        if base > max_depth:
+            raise ValueError("Prefix of length %d exceeds the maximum depth of %d" % (base, max_depth))
+        for k in range(1, base + 1):
+            a[k] = prefix[k-1]
+            problem.make_move(a, k)
+        k = base
+        while True:
+            finished_flag.tick()
+            if finished_flag.is_finished():
+                return self.__unwind(a, k)
+            if problem.is_a_solution(a, k):
+                self.__record_solution(a, k, mode)
+                if finished_flag.is_finished() or k == base:
+                    return self.__unwind(a, k)
+                problem.unmake_move(a, k)
+            elif k == max_depth:
+                if next(iter(problem.construct_candidates(a, k + 1)), EXHAUSTED) is not EXHAUSTED:
+                    self.__unwind(a, k)
+                    raise ValueError("Search exceeded the maximum depth of %d" % max_depth)
+                if k == base:
+                    return self.__unwind(a, k)
+                problem.unmake_move(a, k)
+            else:
+                k = k + 1
+                candidates[k] = iter(problem.construct_candidates(a, k))
+            c = next(candidates[k], EXHAUSTED)
+            while c is EXHAUSTED:
+                candidates[k] = None
+                k = k - 1
+                if k == base:
+                    return self.__unwind(a, k)
+                problem.unmake_move(a, k)
+                c = next(candidates[k], EXHAUSTED)
+            a[k] = c
+            problem.make_move(a, k)
+
+    def prefixes(self, depth):
+        prefix_problem = PrefixProblem(self.problem, depth)
+        Backtracker(prefix_problem, min(depth, self.max_depth)).search(ALL_SOLUTIONS)
+        return prefix_problem.prefixes
+
+    def __record_solution(self, a, k, mode):
+        self.solutions = self.solutions + 1
+        if mode == FIRST_SOLUTION:
+            self.finished_flag.mark_finished()
+        if mode != COUNT_SOLUTIONS:
+            self.process_solution(a, k)
+
+    def __unwind(self, a, k):
+        while k > 0:
+            self.problem.unmake_move(a, k)
+            self.candidates[k] = None
+            k = k - 1
+        return self.solutions
+
+
+class PrefixProblem(BacktrackingProblem):
+
+    def __init__(self, problem, depth):
+        self.problem = problem
+        self.depth = depth
+        self.prefixes = []
+
+    def is_a_solution(self, a, k):
+        return k == self.depth or self.problem.is_a_solution(a, k)
+
+    def process_solution(self, a, k):
+        self.prefixes.append(tuple(a[1:k+1]))
+
+    def construct_candidates(self, a, k):
+        return self.problem.construct_candidates(a, k)
+
+    def make_move(self, a, k):
+        self.problem.make_move(a, k)
+
+    def unmake_move(self, a, k):
+        self.problem.unmake_move(a, k)
+
+
+class SolutionVisitor:
+
+    def __init__(self, visitor, stop_when, finished_flag, reducer=None, initial=None):
+        self.visitor = visitor
+        self.stop_when = stop_when
+        self.finished_flag = finished_flag
+        self.reducer = reducer
+        self.result = [] if reducer is None else initial
+
+    def process_solution(self, a, k):
+        value = tuple(a[1:k+1]) if self.visitor is None else self.visitor(a, k)
+        if self.reducer is None:
+            self.result.append(value)
+        else:
+            self.result = self.reducer(self.result, value)
+        if self.stop_when is not None and self.stop_when(value):
+            self.finished_flag.mark_finished()
+
+
+def init_shard_worker(first_stop):
+    global shard_first_stop
+    shard_first_stop = first_stop
+
+
+def search_shard(make_problem, max_depth, index, prefix, visitor, stop_when, reducer, initial, mode):
+    finished_flag = SharedFinishedFlag(shard_first_stop, index)
+    if mode == COUNT_SOLUTIONS:
+        solutions = Backtracker(make_problem(), max_depth, finished_flag).search(mode, prefix)
+        return solutions, finished_flag.stopped
+    solution_visitor = SolutionVisitor(visitor, stop_when, finished_flag, reducer, initial)
+    Backtracker(make_problem(), max_depth, finished_flag, solution_visitor.process_solution).search(mode, prefix)
+    return solution_visitor.result, finished_flag.stopped
+
+
+def check_shard_arguments(make_problem, visitor, mode, stop_when, reducer, initial):
+    if mode not in (FIRST_SOLUTION, ALL_SOLUTIONS, COUNT_SOLUTIONS):
+        raise ValueError("%s is not a valid search mode" % mode)
+    if mode == COUNT_SOLUTIONS and (visitor is not None or stop_when is not None):
+        raise ValueError("A visitor or stop_when cannot be used when only counting solutions")
+    try:
+        pickle.dumps((make_problem, visitor, stop_when, reducer, initial))
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise ValueError("Shard callbacks must be picklable to reach the worker processes: %s" % e)
+
+
+def run_shards(make_problem, max_depth, shard_depth, visitor, mode, processes, stop_when, reducer, initial):
+    prefixes = Backtracker(make_problem(), max_depth).prefixes(shard_depth)
+    first_stop = multiprocessing.Value('q', len(prefixes))
+    executor = ProcessPoolExecutor(processes, initializer=init_shard_worker, initargs=(first_stop,))
+    try:
+        results = executor.map(search_shard,
+                               [make_problem] * len(prefixes),
+                               [max_depth] * len(prefixes),
+                               range(len(prefixes)),
+                               prefixes,
+                               [visitor] * len(prefixes),
+                               [stop_when] * len(prefixes),
+                               [reducer] * len(prefixes),
+                               [initial] * len(prefixes),
+                               [mode] * len(prefixes))
+        for prefix, (result, stopped) in zip(prefixes, results):
+            yield prefix, result
+            if stopped:
+                return
+    finally:
+        with first_stop.get_lock():
+            first_stop.value = -1
+        executor.shutdown(cancel_futures=True)
+
+
+def stream_shards(make_problem, max_depth, shard_depth, visitor=None, mode=ALL_SOLUTIONS, processes=None,
+                  stop_when=None):
+    check_shard_arguments(make_problem, visitor, mode, stop_when, None, None)
+    return run_shards(make_problem, max_depth, shard_depth, visitor, mode, processes, stop_when, None, None)
+
+
+def reduce_shards(reducer, combine, initial, make_problem, max_depth, shard_depth, visitor=None,
+                  mode=ALL_SOLUTIONS, processes=None, stop_when=None):
+    check_shard_arguments(make_problem, visitor, mode, stop_when, reducer, initial)
+    result = initial
+    for prefix, shard_result in run_shards(make_problem, max_depth, shard_depth, visitor, mode, processes,
+                                           stop_when, reducer, initial):
+        result = combine(result, shard_result)
+    return result
@@ -1,24 +1,6 @@
 import math
 import random
-
-
-class FinishedFlag:
-
-    def __init__(self):
-        self.finished = False
-        self.counter = 0
-
-    def is_finished(self):
-        return self.finished
-
-    def mark_finished(self):
-        self.finished = True
-
-    def tick(self):
-        self.counter = self.counter + 1
-
-    def __str__(self):
-        return "Finished: %s (%d)" % (self.finished, self.counter)
+from backtracking import Backtracker, BacktrackingProblem, FinishedFlag, FIRST_SOLUTION
 
 
 class SudokuExpression:
@@ -111,26 +93,42 @@ class Expression:
         return "%s = %d (%s)" % (str(self), self.result, "Invalid" if self.invalid() else "Valid")
 
 
-def backtrack(available_numbers, puzzle, finished_flag):
-    print(puzzle)
-    finished_flag.tick()
-    if len(available_numbers) == 0 and not puzzle.invalid():
-        finished_flag.mark_finished()
+class ExpressionGridProblem(BacktrackingProblem):
+
+    def __init__(self, available_numbers, puzzle, finished_flag):
+        self.available_numbers = [available_numbers] + [None] * len(available_numbers)
+        self.puzzles = [puzzle] + [None] * len(available_numbers)
+        self.finished_flag = finished_flag
+
+    def is_a_solution(self, a, k):
+        return len(self.available_numbers[k]) == 0 and not self.puzzles[k].invalid()
+
+    def process_solution(self, a, k):
+        puzzle = self.puzzles[k]
         print(puzzle)
-        print(finished_flag)
+        print(self.finished_flag)
         puzzle.print_all_expressions()
-    else:
-        candidates = construct_candidates(available_numbers, puzzle)
-        for c in candidates:
-            next_nums = [num for num in available_numbers if not c == num]
-            backtrack(next_nums, puzzle.add_number(c, puzzle.first_empty_slot()), finished_flag)
-            if finished_flag.is_finished():
-                return
-
-
-# TODO: Is there a way an unfilled expression could give possible candidates?
-def construct_candidates(available_numbers, puzzle):
-    return [] if puzzle.invalid() else sorted(available_numbers, reverse=True)
+
+    # TODO: Is there a way an unfilled expression could give possible candidates?
+    def construct_candidates(self, a, k):
+        puzzle = self.puzzles[k-1]
+        return [] if puzzle.invalid() else sorted(self.available_numbers[k-1], reverse=True)
+
+    def make_move(self, a, k):
+        puzzle = self.puzzles[k-1]
+        self.available_numbers[k] = [num for num in self.available_numbers[k-1] if not a[k] == num]
+        self.puzzles[k] = puzzle.add_number(a[k], puzzle.first_empty_slot())
+        print(self.puzzles[k])
+
+    def unmake_move(self, a, k):
+        self.available_numbers[k] = None
+        self.puzzles[k] = None
+
+
+def backtrack(available_numbers, puzzle, finished_flag):
+    print(puzzle)
+    problem = ExpressionGridProblem(available_numbers, puzzle, finished_flag)
+    Backtracker(problem, len(available_numbers), finished_flag).search(FIRST_SOLUTION)
 
 
 easy_puzzle = SudokuExpression(
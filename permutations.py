@@ -1,59 +1,90 @@
-finished = False
-MAX_CANDIDATES = 2
-NMAX = 10000
-
-
-def backtrack(a, k , n):
-    c = [0] * NMAX
-    ncandidates = 0
-
-    if is_a_solution(a, k, n):
-        process_solution(a, k, n)
-    else:
-        k = k + 1
-        ncandidates = construct_candidates(a, k, n, c, ncandidates)
-        for i in range(ncandidates):
-            a[k] = c[i]
-            make_move(a, k, n)
-            backtrack(a, k, n)
-            unmake_move(a, k, n)
-            if finished:
-                return
-
-
-def is_a_solution(a, k, n):
-    return k == n
-
-
-def process_solution(a, k, n):
-    print('%s' % ' '.join([str(a[i]) for i in range(1, k+1)]))
-
-
-def construct_candidates(a, k, n, c, ncandidates):
-    in_perm = [False] * NMAX
-    for i in range(k):
-        in_perm[a[i]] = True
-    candidates_num = 0
-    for i in range(1, n+1):
-        if not in_perm[i]:
-            c[candidates_num] = i
-            candidates_num = candidates_num + 1
-    return candidates_num
-
-
-def make_move(a, k, n):
-    pass
-
-
-def unmake_move(a, k, n):
-    pass
+import math
+from functools import partial
+from backtracking import Backtracker, BacktrackingProblem, ALL_SOLUTIONS, stream_shards
+
+
+class PermutationProblem(BacktrackingProblem):
+
+    def __init__(self, n):
+        self.n = n
+        self.in_perm = [False] * (n + 1)
+
+    def is_a_solution(self, a, k):
+        return k == self.n
+
+    def process_solution(self, a, k):
+        print('%s' % ' '.join([str(a[i]) for i in range(1, k+1)]))
+
+    def construct_candidates(self, a, k):
+        in_perm = self.in_perm
+        return [i for i in range(1, self.n+1) if not in_perm[i]]
+
+    def make_move(self, a, k):
+        self.in_perm[a[k]] = True
+
+    def unmake_move(self, a, k):
+        self.in_perm[a[k]] = False
+
+
+def rank(perm):
+    n = len(perm)
+    if sorted(perm) != list(range(1, n+1)):
+        raise ValueError("%s is not a permutation of 1-%d" % (list(perm), n))
+    used = 0
+    r = 0
+    for i in range(n):
+        smaller_unused = perm[i] - 1 - bin(used & ((1 << perm[i]) - 1)).count('1')
+        r = r + smaller_unused * math.factorial(n - 1 - i)
+        used = used | (1 << perm[i])
+    return r
+
+
+def unrank(r, n, perm=None):
+    if not 0 <= r < math.factorial(n):
+        raise ValueError("%d is not a valid rank for a permutation of %d items" % (r, n))
+    if perm is None:
+        perm = [0] * n
+    unused = [i for i in range(1, n+1)]
+    for i in range(n):
+        f = math.factorial(n - 1 - i)
+        perm[i] = unused.pop(r // f)
+        r = r % f
+    return perm
+
+
+def next_permutation(perm):
+    i = len(perm) - 2
+    while i >= 0 and perm[i] >= perm[i+1]:
+        i = i - 1
+    if i < 0:
+        return False
+    j = len(perm) - 1
+    while perm[j] <= perm[i]:
+        j = j - 1
+    perm[i], perm[j] = perm[j], perm[i]
+    lo = i + 1
+    hi = len(perm) - 1
+    while lo < hi:
+        perm[lo], perm[hi] = perm[hi], perm[lo]
+        lo = lo + 1
+        hi = hi - 1
+    return True
+
+
+def lexicographic_permutations(n, start=0):
+    perm = unrank(start, n)
+    yield perm
+    while next_permutation(perm):
+        yield perm
 
 
 def generate_permutations(n):
-    buffer = [0] * NMAX
-    backtrack(buffer, 0, n)
+    Backtracker(PermutationProblem(n), n).search(ALL_SOLUTIONS)
 
 
-generate_permutations(3)
+def permutation_shards(n, shard_positions, visitor=None, mode=ALL_SOLUTIONS, processes=None, stop_when=None):
+    return stream_shards(partial(PermutationProblem, n), n, shard_positions, visitor, mode, processes, stop_when)
 
 
+if __name__ == '__main__':
+    generate_permutations(3)
@@ -1,25 +1,7 @@
 # TODO: Small optimizations by using sets instead of arrays when dealing with collections of points,
 #       then point lookup can be done in constant time
 from functools import reduce
-
-
-class FinishedFlag:
-
-    def __init__(self):
-        self.finished = False
-        self.counter = 0
-
-    def is_finished(self):
-        return self.finished
-
-    def mark_finished(self):
-        self.finished = True
-
-    def tick(self):
-        self.counter = self.counter + 1
-
-    def __str__(self):
-        return "Finished: %s (%d)" % (self.finished, self.counter)
+from backtracking import Backtracker, BacktrackingProblem, FinishedFlag, FIRST_SOLUTION
 
 
 class CompositeShape:
@@ -193,36 +175,51 @@ def fill_connected(p, connected, points):
             fill_connected(n, connected, points)
 
 
+class StackingProblem(BacktrackingProblem):
+
+    def __init__(self, available_pieces, board, finished_flag):
+        self.available_pieces = [available_pieces] + [None] * len(available_pieces)
+        self.boards = [board] + [None] * len(available_pieces)
+        self.finished_flag = finished_flag
+
+    def is_a_solution(self, a, k):
+        return self.boards[k].is_full()
+
+    def process_solution(self, a, k):
+        print(self.boards[k])
+        print(self.finished_flag)
+
+    def construct_candidates(self, a, k):
+        available_pieces = self.available_pieces[k-1]
+        board = self.boards[k-1]
+        open_points = board.open_points()
+        smallest_area = smallest_continuous_area(board.open_points())
+        pieces_by_size = sorted(available_pieces, key=lambda shape: -shape.area())
+        if len(available_pieces) > 0 and pieces_by_size[len(pieces_by_size) - 1].area() <= smallest_area:
+            largest_piece = pieces_by_size[0]
+            arrangements = []
+            for oriented_piece in largest_piece.orientations():
+                for x, y in open_points:
+                    moved_piece = oriented_piece.move(x, y)
+                    if board.can_hold(moved_piece):
+                        arrangements.append(moved_piece)
+            return arrangements
+        return []
+
+    def make_move(self, a, k):
+        self.available_pieces[k] = [piece for piece in self.available_pieces[k-1] if not a[k].matches(piece)]
+        self.boards[k] = self.boards[k-1].add(a[k])
+        print(self.boards[k])
+
+    def unmake_move(self, a, k):
+        self.available_pieces[k] = None
+        self.boards[k] = None
+
+
 def backtrack(available_pieces, board, finished_flag):
     print(board)
-    finished_flag.tick()
-    if board.is_full():
-        finished_flag.mark_finished()
-        print(board)
-        print(finished_flag)
-    else:
-        candidates = construct_candidates(available_pieces, board)
-        for c in candidates:
-            next_pieces = [piece for piece in available_pieces if not c.matches(piece)]
-            backtrack(next_pieces, board.add(c), finished_flag)
-            if finished_flag.is_finished():
-                return
-
-
-def construct_candidates(available_pieces, board):
-    open_points = board.open_points()
-    smallest_area = smallest_continuous_area(board.open_points())
-    pieces_by_size = sorted(available_pieces, key=lambda shape: -shape.area())
-    if len(available_pieces) > 0 and pieces_by_size[len(pieces_by_size) - 1].area() <= smallest_area:
-        largest_piece = pieces_by_size[0]
-        arrangements = []
-        for oriented_piece in largest_piece.orientations():
-            for x, y in open_points:
-                moved_piece = oriented_piece.move(x, y)
-                if board.can_hold(moved_piece):
-                    arrangements.append(moved_piece)
-        return arrangements
-    return []
+    problem = StackingProblem(available_pieces, board, finished_flag)
+    Backtracker(problem, len(available_pieces), finished_flag).search(FIRST_SOLUTION)
 
 
 poodle = Shape([(0, 0), (1, 0), (0, 1), (1, 1)], "b")
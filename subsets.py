@@ -1,52 +1,74 @@
-finished = False
-MAX_CANDIDATES = 2
-
-
-def backtrack(a, k , n):
-    c = [0] * MAX_CANDIDATES
-    ncandidates = 0
-
-    if is_a_solution(a, k, n):
-        process_solution(a, k, n)
-    else:
-        k = k + 1
-        ncandidates = construct_candidates(a, k, n, c, ncandidates)
-        for i in range(ncandidates):
-            a[k] = c[i]
-            make_move(a, k, n)
-            backtrack(a, k, n)
-            unmake_move(a, k, n)
-            if finished:
-                return
-
-
-def is_a_solution(a, k, n):
-    return k == n
-
-
-def process_solution(a, k, n):
-    print([i for i in range(1, k+1) if a[i]])
-
-
-def construct_candidates(a, k, n, c, ncandidates):
-    c[0] = False
-    c[1] = True
-    return 2
-
-
-def make_move(a, k, n):
-    pass
-
-
-def unmake_move(a, k, n):
-    pass
+import math
+from functools import partial
+from backtracking import Backtracker, BacktrackingProblem, ALL_SOLUTIONS, stream_shards
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SubsetProblem(BacktrackingProblem):
+
+    def __init__(self, n):
+        self.n = n
+
+    def is_a_solution(self, a, k):
+        return k == self.n
+
+    def process_solution(self, a, k):
+        print([i for i in range(1, k+1) if a[i]])
+
+    def construct_candidates(self, a, k):
+        return (False, True)
+
+
+def colex_codes(ranks, n, k):
+    codes = np.zeros(len(ranks), dtype=np.uint64)
+    remaining = ranks.copy()
+    for i in range(k, 0, -1):
+        binomials = np.array([math.comb(c, i) for c in range(n)], dtype=np.uint64)
+        c = np.searchsorted(binomials, remaining, side='right') - 1
+        codes = codes | (np.uint64(1) << c.astype(np.uint64))
+        remaining = remaining - binomials[c]
+    return codes
+
+
+def subset_blocks(n, chunk_size=4096, k=None, gray=False, packed=False):
+    if np is None:
+        raise ImportError("numpy is required to generate subset blocks")
+    if not 0 <= n <= 64:
+        raise ValueError("%d is not a valid set size, must be between 0-64" % n)
+    if chunk_size < 1:
+        raise ValueError("%d is not a valid chunk size, must be at least 1" % chunk_size)
+    if k is not None and not 0 <= k <= n:
+        raise ValueError("%d is not a valid subset size, must be between 0-%d" % (k, n))
+    if k is not None and gray:
+        raise ValueError("Gray code order is only available when generating all subsets")
+    shifts = np.arange(n, dtype=np.uint64)
+    total = (1 << n) if k is None else math.comb(n, k)
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        ranks = np.arange(stop - start, dtype=np.uint64) + np.uint64(start)
+        if k is not None:
+            codes = colex_codes(ranks, n, k)
+        elif gray:
+            codes = ranks ^ (ranks >> np.uint64(1))
+        else:
+            codes = ranks
+        if packed:
+            yield codes
+        else:
+            yield ((codes[:, None] >> shifts) & np.uint64(1)).astype(bool)
 
 
 def generate_subsets(n):
-    buffer = [0] * pow(2, n)
-    backtrack(buffer, 0, n)
+    Backtracker(SubsetProblem(n), n).search(ALL_SOLUTIONS)
 
 
-generate_subsets(3)
+def subset_shards(n, shard_bits, visitor=None, mode=ALL_SOLUTIONS, processes=None, stop_when=None):
+    return stream_shards(partial(SubsetProblem, n), n, shard_bits, visitor, mode, processes, stop_when)
 
 
+if __name__ == '__main__':
+    generate_subsets(3)
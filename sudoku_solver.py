@@ -1,30 +1,11 @@
 import math
-
-
-class FinishedFlag:
-
-    def __init__(self):
-        self.finished = False
-        self.counter = 0
-
-    def is_finished(self):
-        return self.finished
-
-    def mark_finished(self):
-        self.finished = True
-
-    def tick(self):
-        self.counter = self.counter + 1
-
-    def __str__(self):
-        return "Finished: %s (%d)" % (self.finished, self.counter)
+from backtracking import Backtracker, BacktrackingProblem, FIRST_SOLUTION
 
 
 MAX_CANDIDATES = 2
 SECTOR_DIMENSION = 3
 DIMENSION = 9
 NCELLS = DIMENSION * DIMENSION
-finished_flag = FinishedFlag()
 
 
 class Board:
@@ -77,52 +58,37 @@ class Board:
         return '\n'.join([' '.join([str(contents) if contents else '-' for contents in row]) for row in self.m])
 
 
-def backtrack(a, k, board):
-    finished_flag.tick()
-    if is_a_solution(a, k, board):
-        process_solution(a, k, board)
-    else:
-        k = k + 1
-        candidates = construct_candidates(a, k, board)
-        for c in candidates:
-            a[k] = c
-            make_move(a, k, board)
-            backtrack(a, k, board)
-            unmake_move(a, k, board)
-            if finished_flag.is_finished():
-                return
-
-
-def is_a_solution(a, k, board):
-    return board.free_cells is 0
-
-
-def process_solution(a, k, board):
-    print(board)
-    finished_flag.mark_finished()
+class SudokuProblem(BacktrackingProblem):
 
+    def __init__(self, board):
+        self.board = board
 
-def construct_candidates(a, k, board):
-    next_move = board.next_open_square()
-    if next_move is None or board.dead_end_exists():
-        return []
-    board.plan_move(k, next_move)
-    return board.possible_values(next_move[0], next_move[1])
+    def is_a_solution(self, a, k):
+        return self.board.free_cells == 0
 
+    def process_solution(self, a, k):
+        print(self.board)
 
-def make_move(a, k, board):
-    move = board.moves[k]
-    board.fill(move[0], move[1], a[k])
+    def construct_candidates(self, a, k):
+        next_move = self.board.next_open_square()
+        if next_move is None or self.board.dead_end_exists():
+            return []
+        self.board.plan_move(k, next_move)
+        return self.board.possible_values(next_move[0], next_move[1])
 
+    def make_move(self, a, k):
+        move = self.board.moves[k]
+        self.board.fill(move[0], move[1], a[k])
 
-def unmake_move(a, k, board):
-    move = board.moves[k]
-    board.free(move[0], move[1])
+    def unmake_move(self, a, k):
+        move = self.board.moves[k]
+        self.board.free(move[0], move[1])
 
 
 def generate_solution(board):
-    buffer = [0] * NCELLS
-    backtrack(buffer, 0, board)
+    backtracker = Backtracker(SudokuProblem(board), NCELLS)
+    backtracker.search(FIRST_SOLUTION)
+    return backtracker.finished_flag
 
 easy_board = Board()
 easy_board.fill(1, 0, 8)
@@ -156,5 +122,4 @@ easy_board.fill(7, 7, 9)
 easy_board.fill(8, 7, 8)
 easy_board.fill(7, 8, 2)
 print(easy_board)
-generate_solution(easy_board)
-print(finished_flag)
\ No newline at end of file
+print(generate_solution(easy_board))
\ No newline at end of file
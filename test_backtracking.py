@@ -0,0 +1,172 @@
+import operator
+import time
+import pytest
+from functools import partial
+from backtracking import (Backtracker, BacktrackingProblem, SolutionVisitor, reduce_shards, stream_shards,
+                          ALL_SOLUTIONS, COUNT_SOLUTIONS, FIRST_SOLUTION)
+from permutations import PermutationProblem, permutation_shards, lexicographic_permutations
+from subsets import SubsetProblem, subset_shards
+
+
+class EndsWithOneProblem(PermutationProblem):
+
+    def is_a_solution(self, a, k):
+        return k == self.n and a[k] == 1
+
+
+def ends_with_one(result):
+    return result[-1] == 1
+
+
+class LopsidedProblem(BacktrackingProblem):
+
+    def is_a_solution(self, a, k):
+        return (k == 1 and a[1] == 0) or k == 26
+
+    def construct_candidates(self, a, k):
+        return (0, 1)
+
+
+def subset_size(a, k):
+    return sum(1 for i in range(1, k+1) if a[i])
+
+
+def ignore_solution(a, k):
+    return None
+
+
+def count_solution(total, value):
+    return total + 1
+
+
+def append_solution(results, value):
+    return results + (value,)
+
+
+def serial_results(problem, max_depth, mode=ALL_SOLUTIONS, prefix=()):
+    solution_visitor = SolutionVisitor(None, None, None)
+    Backtracker(problem, max_depth, process_solution=solution_visitor.process_solution).search(mode, prefix)
+    return solution_visitor.result
+
+
+class CountingProblem(SubsetProblem):
+
+    def __init__(self, n):
+        super().__init__(n)
+        self.processed = 0
+
+    def process_solution(self, a, k):
+        self.processed = self.processed + 1
+
+
+def test_search_modes():
+    problem = CountingProblem(6)
+    assert Backtracker(problem, 6).search(ALL_SOLUTIONS) == 64
+    assert problem.processed == 64
+    problem = CountingProblem(6)
+    assert Backtracker(problem, 6).search(COUNT_SOLUTIONS) == 64
+    assert problem.processed == 0
+    backtracker = Backtracker(problem, 6)
+    assert backtracker.search(FIRST_SOLUTION) == 1
+    assert problem.processed == 1
+    assert backtracker.finished_flag.is_finished()
+
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError):
+        Backtracker(SubsetProblem(3), 3).search('some')
+
+
+def test_search_is_not_bounded_by_recursion_limit():
+    assert serial_results(SubsetProblem(5000), 5000, FIRST_SOLUTION) == [(False,) * 5000]
+
+
+def test_search_beyond_max_depth_is_rejected():
+    problem = PermutationProblem(5)
+    with pytest.raises(ValueError):
+        Backtracker(problem, 3).search(COUNT_SOLUTIONS)
+    assert problem.in_perm == [False] * 6
+    with pytest.raises(ValueError):
+        Backtracker(problem, 3).search(COUNT_SOLUTIONS, (1, 2, 3, 4))
+
+
+def test_dead_ends_at_max_depth_are_not_rejected():
+    assert Backtracker(EndsWithOneProblem(4), 4).search(COUNT_SOLUTIONS) == 6
+
+
+def test_search_from_prefix_only_visits_its_subtree():
+    problem = PermutationProblem(5)
+    results = serial_results(problem, 5, prefix=(3, 1))
+    assert results == [tuple(p) for p in lexicographic_permutations(5) if p[:2] == [3, 1]]
+    assert problem.in_perm == [False] * 6
+
+
+def test_prefixes_follow_search_order():
+    assert Backtracker(PermutationProblem(3), 3).prefixes(2) == [(1, 2), (1, 3), (2, 1), (2, 3), (3, 1), (3, 2)]
+    assert Backtracker(SubsetProblem(2), 2).prefixes(5) == [(False, False), (False, True), (True, False), (True, True)]
+
+
+def test_sharded_subsets_match_serial_search():
+    shards = list(subset_shards(8, 3, processes=2))
+    assert [prefix for prefix, _ in shards] == Backtracker(SubsetProblem(8), 8).prefixes(3)
+    assert [r for _, results in shards for r in results] == serial_results(SubsetProblem(8), 8)
+    assert sum(count for _, count in subset_shards(8, 3, mode=COUNT_SOLUTIONS, processes=2)) == 256
+
+
+def test_sharded_permutations_match_serial_search():
+    merged = list(r for _, results in permutation_shards(6, 2, processes=2) for r in results)
+    assert merged == serial_results(PermutationProblem(6), 6)
+    count = reduce_shards(None, operator.add, 0, partial(PermutationProblem, 7), 7, 2, mode=COUNT_SOLUTIONS,
+                          processes=2)
+    assert count == Backtracker(PermutationProblem(7), 7).search(COUNT_SOLUTIONS)
+
+
+def test_reduce_shards_folds_inside_each_shard():
+    total = reduce_shards(operator.add, operator.add, 0, partial(SubsetProblem, 10), 10, 3, visitor=subset_size,
+                          processes=2)
+    assert total == 10 * 512
+    solutions = reduce_shards(count_solution, operator.add, 0, partial(SubsetProblem, 10), 10, 3,
+                              visitor=ignore_solution, processes=2)
+    assert solutions == 1024
+    merged = reduce_shards(append_solution, operator.add, (), partial(PermutationProblem, 5), 5, 1, processes=2)
+    assert list(merged) == serial_results(PermutationProblem(5), 5)
+
+
+def test_first_solution_matches_serial_search():
+    shards = list(stream_shards(partial(EndsWithOneProblem, 7), 7, 1, mode=FIRST_SOLUTION, processes=2))
+    assert [prefix for prefix, _ in shards] == [(1,), (2,)]
+    found = [r for _, results in shards for r in results]
+    assert found == serial_results(EndsWithOneProblem(7), 7, FIRST_SOLUTION)
+    assert found == [(2, 3, 4, 5, 6, 7, 1)]
+
+
+def test_visitor_can_stop_every_shard():
+    shards = list(permutation_shards(7, 1, stop_when=ends_with_one, processes=2))
+    assert [prefix for prefix, _ in shards] == [(1,), (2,)]
+    found = [r for _, results in shards for r in results]
+    expected = [tuple(p) for p in lexicographic_permutations(7)]
+    assert found == expected[:expected.index((2, 3, 4, 5, 6, 7, 1)) + 1]
+
+
+def test_closing_the_stream_stops_the_workers():
+    shards = stream_shards(LopsidedProblem, 26, 1, mode=COUNT_SOLUTIONS, processes=2)
+    started = time.time()
+    assert next(shards) == ((0,), 1)
+    shards.close()
+    assert time.time() - started < 10
+
+
+def test_unpicklable_callbacks_are_rejected():
+    with pytest.raises(ValueError):
+        list(permutation_shards(4, 1, visitor=lambda a, k: 1, processes=2))
+    with pytest.raises(ValueError):
+        list(permutation_shards(4, 1, stop_when=lambda r: True, processes=2))
+    with pytest.raises(ValueError):
+        reduce_shards(lambda total, value: total, operator.add, 0, partial(PermutationProblem, 4), 4, 1)
+
+
+def test_count_mode_rejects_solution_callbacks():
+    with pytest.raises(ValueError):
+        permutation_shards(6, 1, mode=COUNT_SOLUTIONS, stop_when=ends_with_one)
+    with pytest.raises(ValueError):
+        permutation_shards(6, 1, mode=COUNT_SOLUTIONS, visitor=subset_size)
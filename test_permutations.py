@@ -0,0 +1,56 @@
+import itertools
+import pytest
+from backtracking import Backtracker, COUNT_SOLUTIONS
+from permutations import PermutationProblem, lexicographic_permutations, next_permutation, rank, unrank
+
+
+def test_permutation_problem_counts_every_permutation():
+    assert Backtracker(PermutationProblem(6), 6).search(COUNT_SOLUTIONS) == 720
+
+
+def test_lexicographic_permutations_match_itertools():
+    for n in range(1, 7):
+        expected = [list(p) for p in itertools.permutations(range(1, n+1))]
+        assert [list(p) for p in lexicographic_permutations(n)] == expected
+
+
+def test_lexicographic_permutations_reuse_one_buffer():
+    buffers = {id(perm) for perm in lexicographic_permutations(4)}
+    assert len(buffers) == 1
+
+
+def test_lexicographic_permutations_resume_at_any_index():
+    expected = [list(p) for p in itertools.permutations(range(1, 6))]
+    for start in (0, 1, 57, 119):
+        assert [list(p) for p in lexicographic_permutations(5, start)] == expected[start:]
+
+
+def test_rank_and_unrank_round_trip():
+    for n in range(1, 7):
+        for i, perm in enumerate(itertools.permutations(range(1, n+1))):
+            assert rank(perm) == i
+            assert unrank(i, n) == list(perm)
+
+
+def test_unrank_fills_the_given_buffer():
+    buffer = [0] * 4
+    assert unrank(23, 4, buffer) is buffer
+    assert buffer == [4, 3, 2, 1]
+
+
+def test_next_permutation_stops_at_the_last_permutation():
+    perm = [3, 2, 1]
+    assert not next_permutation(perm)
+    assert perm == [3, 2, 1]
+
+
+@pytest.mark.parametrize('perm', [[0, 1, 2], (5, 6, 7), [1, 1, 2], [1, 3]])
+def test_rank_rejects_non_permutations(perm):
+    with pytest.raises(ValueError):
+        rank(perm)
+
+
+@pytest.mark.parametrize('r', [-1, 24])
+def test_unrank_rejects_out_of_range_ranks(r):
+    with pytest.raises(ValueError):
+        unrank(r, 4)
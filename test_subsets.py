@@ -0,0 +1,72 @@
+import itertools
+import pytest
+from backtracking import Backtracker, COUNT_SOLUTIONS
+from subsets import SubsetProblem, subset_blocks
+
+np = pytest.importorskip('numpy')
+
+
+def rows_of(blocks):
+    return [tuple(bool(bit) for bit in row) for block in blocks for row in block]
+
+
+def test_subset_problem_counts_every_subset():
+    assert Backtracker(SubsetProblem(10), 10).search(COUNT_SOLUTIONS) == 1024
+
+
+def test_blocks_match_binary_counter_order():
+    n = 5
+    expected = [tuple(reversed(bits)) for bits in itertools.product([False, True], repeat=n)]
+    assert rows_of(subset_blocks(n, chunk_size=7)) == expected
+
+
+def test_blocks_are_filled_to_chunk_size():
+    sizes = [len(block) for block in subset_blocks(6, chunk_size=8, k=2)]
+    assert sizes == [8, 7]
+    assert [len(block) for block in subset_blocks(5, chunk_size=10)] == [10, 10, 10, 2]
+
+
+def test_k_subsets_match_combinations():
+    n = 7
+    for k in range(n + 1):
+        rows = rows_of(subset_blocks(n, chunk_size=4, k=k))
+        members = sorted(tuple(i for i in range(n) if row[i]) for row in rows)
+        assert members == list(itertools.combinations(range(n), k))
+        assert len(set(rows)) == len(rows)
+
+
+def test_k_subsets_are_in_colex_order():
+    codes = np.concatenate(list(subset_blocks(8, chunk_size=5, k=3, packed=True)))
+    assert list(codes) == sorted(code for code in range(256) if bin(code).count('1') == 3)
+
+
+def test_k_subsets_of_large_sets_do_not_scan_every_code():
+    blocks = list(subset_blocks(64, chunk_size=50000, k=3, packed=True))
+    codes = np.concatenate(blocks)
+    assert len(codes) == 41664
+    assert len(set(codes.tolist())) == len(codes)
+    assert codes[-1] == (7 << 61)
+
+
+def test_gray_codes_change_one_bit_at_a_time():
+    codes = np.concatenate(list(subset_blocks(8, chunk_size=30, gray=True, packed=True))).tolist()
+    assert sorted(codes) == list(range(256))
+    assert all(bin(a ^ b).count('1') == 1 for a, b in zip(codes, codes[1:]))
+
+
+def test_packed_codes_match_boolean_rows():
+    packed = np.concatenate(list(subset_blocks(6, chunk_size=16, packed=True)))
+    rows = np.concatenate(list(subset_blocks(6, chunk_size=16)))
+    assert [sum(1 << i for i in range(6) if row[i]) for row in rows] == packed.tolist()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'n': 65},
+    {'n': 4, 'chunk_size': 0},
+    {'n': 4, 'k': 5},
+    {'n': 4, 'k': -1},
+    {'n': 4, 'k': 2, 'gray': True},
+])
+def test_invalid_arguments_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        list(subset_blocks(**kwargs))